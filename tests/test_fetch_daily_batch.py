@@ -0,0 +1,108 @@
+"""
+Caching behaviour of the batched Oura daily fetch.
+
+Run with: python -m unittest discover -s tests
+"""
+
+import json
+import unittest
+from datetime import date
+from unittest import mock
+
+import requests
+
+import app
+
+START, END = date(2026, 2, 1), date(2026, 2, 7)
+TOKENS = {'twin_a': 'token-a'}
+SPO2_URL = app.OURA_API_BASE + app.OURA_DAILY_ENDPOINTS['daily_spo2']
+RESILIENCE_URL = app.OURA_API_BASE + app.OURA_DAILY_ENDPOINTS['resilience']
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, payload=None):
+        self.status_code = status_code
+        self.content = json.dumps(payload if payload is not None else {}).encode()
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class FakeSession:
+    """Answers every endpoint with one record unless overridden per URL."""
+
+    def __init__(self, overrides=None):
+        self.overrides = dict(overrides or {})
+        self.calls = []
+
+    def get(self, url, **kwargs):
+        self.calls.append(url)
+        outcome = self.overrides.get(url)
+        if isinstance(outcome, Exception):
+            raise outcome
+        if outcome is not None:
+            return FakeResponse(outcome)
+        return FakeResponse(200, {'data': [{'day': '2026-02-01'}]})
+
+
+class FetchDailyBatchCacheTest(unittest.TestCase):
+    def setUp(self):
+        app._fetch_daily_batch.clear()
+        patcher = mock.patch.object(app, 'reserve_rate_limit', return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(app._fetch_daily_batch.clear)
+
+    def fetch(self, session):
+        with mock.patch.object(app, '_oura_session', return_value=session):
+            return app._fetch_daily_batch(app._token_digest(TOKENS), START, END, TOKENS)
+
+    def test_transient_failure_is_retried_not_cached(self):
+        failures = {
+            '429': 429, '500': 500, '503': 503,
+            'timeout': requests.Timeout('read timed out'),
+            'connection': requests.ConnectionError('reset'),
+        }
+        for name, failure in failures.items():
+            with self.subTest(failure=name):
+                app._fetch_daily_batch.clear()
+                with self.assertRaises(app._PartialBatch) as ctx:
+                    self.fetch(FakeSession({SPO2_URL: failure}))
+                # The rest of the batch is still handed back for this rerun
+                partial = ctx.exception.results['twin_a']
+                self.assertEqual(partial['daily_spo2'], [])
+                self.assertEqual(len(partial['sleep']), 1)
+
+                # Next call goes back to the API instead of the cache
+                session = FakeSession()
+                results = self.fetch(session)
+                self.assertIn(SPO2_URL, session.calls)
+                self.assertEqual(len(results['twin_a']['daily_spo2']), 1)
+
+    def test_permanent_403_is_cached(self):
+        first = self.fetch(FakeSession({RESILIENCE_URL: 403}))
+        self.assertEqual(first['twin_a']['resilience'], [])
+
+        session = FakeSession()
+        second = self.fetch(session)
+        self.assertEqual(session.calls, [])
+        self.assertEqual(second['twin_a']['resilience'], [])
+
+    def test_unauthorized_token_is_cached(self):
+        # A revoked/expired token fails on every endpoint; refetching all of
+        # them each rerun would only burn rate-limit budget
+        session = FakeSession({
+            app.OURA_API_BASE + url: 401 for url in app.OURA_DAILY_ENDPOINTS.values()
+        })
+        first = self.fetch(session)
+        self.assertEqual(len(session.calls), len(app.OURA_DAILY_ENDPOINTS))
+        self.assertEqual(first['twin_a']['daily_spo2'], [])
+
+        session = FakeSession()
+        second = self.fetch(session)
+        self.assertEqual(session.calls, [])
+        self.assertEqual(second['twin_a']['sleep'], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
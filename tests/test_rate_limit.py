@@ -0,0 +1,30 @@
+"""
+Process-wide Oura rate-limit budget.
+
+Run with: python -m unittest discover -s tests
+"""
+
+import unittest
+
+import app
+
+
+class ReserveRateLimitTest(unittest.TestCase):
+    def setUp(self):
+        # Fresh window: the limiter is a process-wide cache_resource dict
+        limiter = app._rate_limiter()
+        with limiter['lock']:
+            limiter['count'] = 0
+            limiter['reset'] = 0.0
+
+    def test_batch_that_does_not_fit_takes_nothing(self):
+        self.assertTrue(app.reserve_rate_limit(app.RATE_LIMIT_REQUESTS - 5))
+        self.assertFalse(app.reserve_rate_limit(12))
+        self.assertEqual(app.rate_limit_remaining(), 5)
+        self.assertTrue(app.reserve_rate_limit(5))
+        self.assertFalse(app.check_rate_limit())
+        self.assertEqual(app.rate_limit_remaining(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()